@@ -1,5 +1,6 @@
 import network
 import socket
+import time
 
 # Create Wi-Fi access point
 ap = network.WLAN(network.AP_IF)
@@ -8,7 +9,7 @@ ap.active(True)  # Enable AP mode
 
 print("Pico W Access Point Created!")
 while not ap.active():
-    pass  # Wait until the AP is active
+    time.sleep_ms(50)  # Wait until the AP is active without spinning
 
 print("Access Point IP Address:", ap.ifconfig()[0])
 
@@ -20,9 +21,20 @@ html = """<!DOCTYPE html>
 </html>
 """
 
+# Preformat the full response once (headers + body, proper CRLF line
+# endings) so the serve loop allocates nothing per request
+_body = html.encode()
+_RESP = ("HTTP/1.1 200 OK\r\n"
+         "Content-Type: text/html\r\n"
+         "Content-Length: {}\r\n"
+         "Connection: close\r\n"
+         "\r\n".format(len(_body))).encode() + _body
+
 # Start a web server
 addr = ("0.0.0.0", 80)
 s = socket.socket()
+# Allow quick restarts without "address in use" hangs
+s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 s.bind(addr)
 s.listen(5)
 print("Web Server Started! Connect to:", ap.ifconfig()[0])
@@ -30,6 +42,22 @@ print("Web Server Started! Connect to:", ap.ifconfig()[0])
 while True:
     conn, addr = s.accept()
     print("Client connected from", addr)
-    request = conn.recv(1024)  # Read the request
-    conn.send("HTTP/1.1 200 OK\nContent-Type: text/html\n\n" + html)  # Send response
-    conn.close()
+    # Read only up to the end of the request headers instead of a blind
+    # 1024-byte recv; we never parse a body, so don't wait for one
+    conn.settimeout(0.1)
+    request = b""
+    try:
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(256)
+            if not chunk:
+                break
+            request += chunk
+    except OSError:
+        pass  # Slow or misbehaving client; respond with what we have
+    conn.settimeout(None)  # Let the send block; the timeout was for the read
+    try:
+        conn.sendall(_RESP)  # Send the preformatted response in full
+    except OSError:
+        pass  # Client reset or vanished mid-send
+    finally:
+        conn.close()
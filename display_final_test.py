@@ -1,154 +1,188 @@
+import micropython
 import network
 import socket
-import struct
-import time
-from machine import I2C, Pin, ADC, SPI
+import uasyncio as asyncio
+from machine import Pin, ADC, SPI
 from ili9341 import Display, color565
+# Shared SEN55 driver (CRC table, frame decode, data-ready polling)
+from sen55 import read_sen55, start_measurement
 
-# ---------------------- SEN55 and MQ7 Sensor Setup ---------------------- #
-
-# Initialize I2C for SEN55 (GP4 = SDA, GP5 = SCL)
-i2c = I2C(0, scl=Pin(5), sda=Pin(4), freq=100000)
-SEN55_ADDR = 0x69  # SEN55 I2C Address
+# ---------------------- MQ7 Sensor Setup ---------------------- #
 
 # Initialize MQ7 on GP26 (ADC0)
 mq7 = ADC(Pin(26))
 
-# Commands for SEN55
-CMD_START_MEASUREMENT = bytearray([0x00, 0x21])
-CMD_READ_VALUES = bytearray([0x03, 0xC4])
-
-# CRC-8 calculation (Polynomial 0x31)
-def crc8(data):
-    crc = 0xFF
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x80:
-                crc = (crc << 1) ^ 0x31
-            else:
-                crc <<= 1
-            crc &= 0xFF  # Keep 8-bit
-    return crc
-
-# Function to start SEN55 measurement
-def start_measurement():
-    try:
-        i2c.writeto(SEN55_ADDR, CMD_START_MEASUREMENT)
-        print("✅ SEN55 Measurement Started")
-    except Exception as e:
-        print("⚠️ Error starting measurement:", e)
-
-# Function to read and decode SEN55 data
-def read_sen55():
-    try:
-        i2c.writeto(SEN55_ADDR, CMD_READ_VALUES)
-        time.sleep(0.1)
-        data = i2c.readfrom(SEN55_ADDR, 24)
-
-        values = []
-        for i in range(0, 24, 3):
-            raw_bytes = data[i:i+2]
-            crc_received = data[i+2]
-            if crc8(raw_bytes) != crc_received:
-                print(f"⚠️ Checksum error at index {i//3}! Skipping...")
-                values.append(None)
-            else:
-                value = struct.unpack(">h", raw_bytes)[0]
-                values.append(value)
-
-        # Convert raw values to proper units (per your sensor datasheet)
-        pm1_0    = values[0] / 10.0 if values[0] is not None else None
-        pm2_5    = values[1] / 10.0 if values[1] is not None else None
-        pm10     = values[3] / 10.0 if values[3] is not None else None
-        humidity = values[4] / 100.0 if values[4] is not None else None
-        temperature = values[5] / 200.0 if values[5] is not None else None
-        voc_index = values[6] / 10.0 if values[6] is not None else None
-        nox_index = values[7] / 10.0 if values[7] is not None else None
-
-        return pm1_0, pm2_5, pm10, humidity, temperature, voc_index, nox_index
-
-    except Exception as e:
-        print("⚠️ Error reading SEN55:", e)
-        return None, None, None, None, None, None, None
+# Average 64 ADC samples to knock down single-sample noise (~1 LSB);
+# native-compiled so the oversampling loop stays cheap
+@micropython.native
+def _mq7_avg64():
+    read = mq7.read_u16
+    total = 0
+    for _ in range(64):
+        total += read()
+    return total >> 6
 
 # Function to read CO concentration from MQ7 sensor
 def read_mq7():
-    raw_value = mq7.read_u16()  # ADC 16-bit reading
-    voltage = (raw_value / 65535) * 3.3  # Convert to voltage (0-3.3V)
-    co_ppm = max(0, (voltage - 0.2) * 100)  # Example scaling; adjust via calibration
-    return co_ppm
+    """Returns CO concentration as integer ppm x10 (fixed point)."""
+    raw_value = _mq7_avg64()  # Oversampled 16-bit reading
+    millivolts = raw_value * 3300 // 65535  # Convert to mV (0-3300)
+    # (V - 0.2) * 100 ppm at x10 scale reduces to mV - 200;
+    # example scaling, adjust via calibration
+    return max(0, millivolts - 200)
 
 # Helper function to get full sensor readings (8 values)
 def get_sensor_readings():
-    sen55_values = read_sen55()  # Returns 7 values
-    co = read_mq7()             # Get CO value from MQ7 sensor
+    raw = read_sen55()          # 8 raw int16 values from SEN55
+    co = read_mq7()             # CO as ppm x10, already integer
     # If SEN55 reading failed, return all Nones
-    if sen55_values[0] is None:
+    if raw[0] is None:
         return (None,) * 8
-    return sen55_values + (co,)
+    # PM4.0 (index 2) is decoded for CRC coverage but not displayed
+    return raw[:2] + raw[3:] + (co,)
 
 # ---------------------- ILI9341 Display Setup ---------------------- #
 
-def update_display(display, sensor_data, indices):
+# Static row pieces: each row is label + formatted value + unit, indexed
+# by sensor position. Kept as bytes so they live in flash, not RAM.
+_LABELS = (b"PM1.0: ", b"PM2.5: ", b"PM10: ", b"Humidity: ",
+           b"Temp: ", b"VOC idx: ", b"NOx idx: ", b"CO: ")
+_UNITS = (b" ug/m3", b" ug/m3", b" ug/m3", b"%", b" C", b"", b"", b" ppm")
+# Fixed-point rendering of raw values: shown = value * mult / 10**dec.
+# PM/VOC/NOx are raw/10, humidity raw/100, CO already ppm x10;
+# temperature raw/200 is rendered as raw*5 with 3 decimals
+_RAW_MULT = (1, 1, 1, 1, 5, 1, 1, 1)
+_DECIMALS = (1, 1, 1, 2, 3, 1, 1, 1)
+
+# Preallocated per-row text buffers, formatted in place each refresh so
+# no strings are built unless a row actually changed; one row per sensor
+_ROW_W = 32
+_row_buf = [bytearray(_ROW_W) for _ in range(8)]
+_last_buf = [bytearray(_ROW_W) for _ in range(8)]
+_last_len = [0] * 8
+
+@micropython.viper
+def int_to_ascii(buf: ptr8, offset: int, value: int, decimals: int) -> int:
+    """Write value/10**decimals as fixed-point ASCII into buf at offset.
+
+    Args:
+        buf (ptr8): Destination byte buffer.
+        offset (int): Write position in buf.
+        value (int): Scaled integer value (e.g. 123 with decimals=1 -> "12.3").
+        decimals (int): Digits after the decimal point (0 = no point).
+    Returns:
+        int: Offset just past the last byte written.
+    """
+    if value < 0:
+        buf[offset] = 0x2D  # '-'
+        offset += 1
+        value = -value
+    # Count digits; keep at least decimals+1 so "0.x" keeps its zero
+    ndig = 1
+    v = value
+    while v >= 10:
+        v //= 10
+        ndig += 1
+    if ndig < decimals + 1:
+        ndig = decimals + 1
+    length = ndig
+    if decimals:
+        length += 1  # Room for the '.'
+    i = offset + length - 1
+    written = 0
+    while written < ndig:
+        if decimals:
+            if written == decimals:
+                buf[i] = 0x2E  # '.'
+                i -= 1
+        buf[i] = 0x30 + value % 10
+        value //= 10
+        i -= 1
+        written += 1
+    return offset + length
+
+def update_display(display, sensor_data):
     """
-    Clear the display and show sensor readings for the given indices.
+    Show all 8 sensor readings as one fixed 8-row frame, formatting each
+    row into a preallocated buffer and redrawing only the 8x8 character
+    cells that changed since the last call (incremental rendering).
     Uses the built-in 8x8 font via draw_text8x8().
-    
+
     Args:
         display (Display): The ILI9341 display object.
         sensor_data (tuple): Tuple containing 8 sensor readings.
-        indices (list): List of indices in sensor_data to display.
     """
-    display.clear(color565(0, 0, 0))  # Clear display to black
     y = 10  # Starting y coordinate for text
-    for i in indices:
-        if i == 0:
-            text = "PM1.0: {} ug/m3".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 1:
-            text = "PM2.5: {} ug/m3".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 2:
-            text = "PM10: {} ug/m3".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 3:
-            text = "Humidity: {}%".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 4:
-            text = "Temp: {} C".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 5:
-            text = "VOC idx: {}".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 6:
-            text = "NOx idx: {}".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
-        elif i == 7:
-            text = "CO: {} ppm".format(sensor_data[i] if sensor_data[i] is not None else "ERR")
+    for row in range(8):
+        buf = _row_buf[row]
+        label = _LABELS[row]
+        n = len(label)
+        buf[0:n] = label
+        value = sensor_data[row]
+        if value is None:
+            buf[n:n+3] = b"ERR"
+            n += 3
         else:
-            text = "Unknown"
-        # Use draw_text8x8(x, y, text, color, background)
-        display.draw_text8x8(10, y, text, color565(255, 255, 255))
-        y += 10  # Increment y; adjust spacing as needed
+            n = int_to_ascii(buf, n, value * _RAW_MULT[row], _DECIMALS[row])
+        unit = _UNITS[row]
+        buf[n:n+len(unit)] = unit
+        n += len(unit)
+
+        # Per-character diff: draw only the cells that changed since the
+        # last refresh (a typical update touches 2-3 digits of a row)
+        last = _last_buf[row]
+        last_n = _last_len[row]
+        width = n if n > last_n else last_n
+        for j in range(width):
+            new_ch = buf[j] if j < n else 0x20
+            old_ch = last[j] if j < last_n else 0x20
+            if new_ch == old_ch:
+                continue
+            x = 10 + j * 8
+            if new_ch == 0x20:
+                # Blank cell: a fill is cheaper than drawing a space
+                display.fill_rectangle(x, y, 8, 8, color565(0, 0, 0))
+            else:
+                display.draw_text8x8(x, y, chr(new_ch),
+                                     color565(255, 255, 255))
+        last[0:n] = buf[0:n]
+        _last_len[row] = n
+        y += 12  # Row pitch; 8 px glyphs plus 4 px spacing
 
-# ---------------------- Main Loop ---------------------- #
+# ---------------------- Cooperative Tasks ---------------------- #
 
-def main():
+# Latest sensor readings shared between tasks (8 values: 7 SEN55, 1 MQ7)
+_latest = [None] * 8
+
+async def sensor_task():
+    """Refresh the shared readings every 2 seconds."""
+    while True:
+        sensor_values = get_sensor_readings()
+        for i in range(8):
+            _latest[i] = sensor_values[i]
+        await asyncio.sleep_ms(2000)
+
+async def display_task(display):
+    """Refresh the single 8-reading frame every 5 seconds."""
+    while True:
+        update_display(display, _latest)
+        await asyncio.sleep(5)
+
+async def main():
     # Start SEN55 measurement
     start_measurement()
-    time.sleep(2)  # Allow sensor to settle
-    
+    await asyncio.sleep(2)  # Allow sensor to settle
+
     # Initialize SPI and display (using your library)
-    spi = SPI(1, baudrate=10000000, sck=Pin(14), mosi=Pin(15))
+    # 31.25 MHz = SYSCLK/4; the ILI9341 sustains this comfortably and it
+    # triples SPI throughput over the old 10 MHz setting
+    spi = SPI(1, baudrate=31_250_000, polarity=0, phase=0,
+              sck=Pin(14), mosi=Pin(15))
     display = Display(spi, cs=Pin(17), dc=Pin(6), rst=Pin(7))
-    
-    while True:
-        # Fetch sensor readings (8 values: 7 from SEN55, 1 from MQ7)
-        sensor_values = get_sensor_readings()
-        
-        # Display first 4 readings for 5 seconds:
-        # PM1.0, PM2.5, PM10, Humidity
-        update_display(display, sensor_values, [0, 1, 2, 3])
-        time.sleep(5)
-        
-        # Display next 4 readings for 5 seconds:
-        # Temperature, VOC index, NOx index, CO
-        update_display(display, sensor_values, [4, 5, 6, 7])
-        time.sleep(5)
+
+    # Sensor polling and display refresh run as cooperative tasks, so
+    # I2C waits no longer block SPI redraws (and vice versa)
+    await asyncio.gather(sensor_task(), display_task(display))
 
 # Run the main loop
-main()
+asyncio.run(main())
@@ -0,0 +1,18 @@
+# MicroPython firmware manifest for the air quality monitor.
+#
+# Freezing the scripts moves their precompiled bytecode into flash
+# (XIP): no parse/compile pass at every boot and no RAM copy of the
+# bytecode. @micropython.native functions are compiled by mpy-cross and
+# frozen in native form as well. Build from a micropython checkout with:
+#
+#   make -C ports/rp2 BOARD=RPI_PICO_W FROZEN_MANIFEST=$(pwd)/manifest.py
+#
+# and flash the resulting firmware.uf2. For files deployed loose on the
+# device filesystem instead, precompile them with:
+#
+#   mpy-cross -O3 -march=armv6m <file>.py
+
+include("$(PORT_DIR)/boards/manifest.py")
+# opt=3 matches the -O3 loose-file build: drops asserts, __debug__
+# branches and line numbers from the frozen bytecode
+freeze(".", ("sen55.py", "ili9341.py", "display_final_test.py"), opt=3)
@@ -0,0 +1,126 @@
+"""Shared SEN55 driver for the Pico W air quality monitor.
+
+Both the wired test script and the display application used to carry
+their own copies of the CRC-8 code and frame decode; keeping a single
+module means one compiled function object at runtime (and one candidate
+for freezing into the firmware with mpy-cross).
+"""
+from machine import I2C, Pin
+import micropython
+import time
+import struct
+
+# Initialize I2C on Pico W (I2C0 with GP4 = SDA, GP5 = SCL)
+i2c = I2C(0, scl=Pin(5), sda=Pin(4), freq=100000)
+SEN55_ADDR = 0x69  # Default I²C address for SEN55
+
+# Commands
+CMD_START_MEASUREMENT = bytearray([0x00, 0x21])
+CMD_READ_DATA_READY = bytearray([0x02, 0x02])
+CMD_READ_VALUES = bytearray([0x03, 0xC4])
+
+# Unpack format for a full 24-byte frame: 8 x (Big-Endian int16 + CRC byte)
+_FMT = ">hBhBhBhBhBhBhBhB"
+
+# Per-value scale factors (multiplicative inverses of the datasheet
+# divisors) for callers that want engineering units rather than the raw
+# int16s: PM x4, humidity, temperature, VOC index, NOx index
+SCALE = (0.1, 0.1, 0.1, 0.1, 0.01, 0.005, 0.1, 0.1)
+
+# Persistent I2C read buffers, reused across calls to avoid per-read
+# heap allocation (and the GC pressure that comes with it)
+_buf = bytearray(24)
+_mv = memoryview(_buf)
+_ready_buf = bytearray(3)
+
+# CRC-8 lookup table (Polynomial 0x31), built once at import time.
+# Kept as bytes so MicroPython can store it in flash instead of RAM.
+def _build_crc8_table():
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = (crc << 1) ^ 0x31
+            else:
+                crc <<= 1
+            crc &= 0xFF  # Keep it 8-bit
+        table[i] = crc
+    return bytes(table)
+
+CRC8_TABLE = _build_crc8_table()
+
+# Slice-by-2 companion table: because CRC-8 is linear over GF(2), the
+# CRC of a 2-byte word is CRC8_T0[0xFF ^ b0] ^ CRC8_TABLE[b1], i.e. one
+# independent lookup per byte with no serial dependency between them
+CRC8_T0 = bytes(CRC8_TABLE[CRC8_TABLE[i]] for i in range(256))
+
+# CRC-8 calculation (Polynomial 0x31)
+@micropython.native
+def crc8(data):
+    """Calculates CRC-8 checksum using a table lookup per byte."""
+    crc = 0xFF
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+
+# Function to start measurement
+def start_measurement():
+    """Sends command to start continuous measurement on SEN55."""
+    try:
+        i2c.writeto(SEN55_ADDR, CMD_START_MEASUREMENT)
+        print("✅ SEN55 Measurement Started")
+    except Exception as e:
+        print("⚠️ Error starting measurement:", e)
+
+# Function to read and decode SEN55 data (Big-Endian int16)
+@micropython.native
+def read_sen55():
+    """Reads a frame from the SEN55 and verifies checksums.
+
+    Returns a tuple of 8 raw int16 values (PM1.0, PM2.5, PM4.0, PM10,
+    humidity, temperature, VOC index, NOx index), with None in any slot
+    that failed its CRC. Apply SCALE for engineering units.
+    """
+    try:
+        # Poll the data-ready flag instead of a fixed 100 ms sleep. The
+        # SEN55 does not clock-stretch, so each read must wait the ~20 ms
+        # command execution time after the write; worst case ~200 ms
+        # before giving up and reading anyway
+        for _ in range(10):
+            i2c.writeto(SEN55_ADDR, CMD_READ_DATA_READY)
+            time.sleep_ms(20)
+            i2c.readfrom_into(SEN55_ADDR, _ready_buf)  # padding, flag, CRC
+            if _ready_buf[1] & 1:
+                break
+
+        # Request measurement data. The sensor answers whichever command
+        # was written last, so this must come after the ready poll, and
+        # it needs the same execution-time gap before the read
+        i2c.writeto(SEN55_ADDR, CMD_READ_VALUES)
+        time.sleep_ms(20)
+
+        # Read 24 bytes (Each value is 2 bytes + 1 checksum byte) into
+        # the persistent buffer; no fresh bytes object per read
+        i2c.readfrom_into(SEN55_ADDR, _buf)
+        data = _mv
+
+        # Decode all 8 words and CRC bytes in a single C-level unpack call
+        unpacked = struct.unpack(_FMT, data)
+
+        values = []
+        for i in range(8):
+            # Verify checksum: one independent lookup per byte plus an
+            # XOR (slice-by-2), no slicing or function call
+            crc_calc = CRC8_T0[0xFF ^ data[i*3]] ^ CRC8_TABLE[data[i*3+1]]
+            if crc_calc != unpacked[2*i+1]:
+                print(f"⚠️ Checksum error at index {i}! Skipping...")
+                values.append(None)
+            else:
+                values.append(unpacked[2*i])
+
+        return tuple(values)
+
+    except Exception as e:
+        print("⚠️ Error reading SEN55:", e)
+        return (None,) * 8